@@ -1,5 +1,6 @@
 import gradio as gr
 import os
+import logging
 import dotenv
 from main import StatefulOrchestrator
 
@@ -96,4 +97,5 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Genica") as demo:
     )
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     demo.launch(share=True)
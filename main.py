@@ -1,4 +1,5 @@
 import os
+import logging
 import dotenv
 from google import genai
 from google.genai import types
@@ -99,6 +100,7 @@ class StatefulOrchestrator:
 
 
 def main_demo():
+    logging.basicConfig(level=logging.INFO)
     gemini_api_key = os.environ.get("GEMINI_API_KEY")
     if not gemini_api_key:
         raise ValueError("GEMINI_API_KEY not found in environment variables.")
@@ -1,8 +1,17 @@
 import os
+import json
+import orjson
+import atexit
+import hashlib
+import threading
+import time
 import dotenv
 import requests
-from typing import Dict, Any, List, Optional, Literal
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Iterator, List, Optional, Literal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Configuration & Initialization ---
 dotenv.load_dotenv()
@@ -10,6 +19,39 @@ dotenv.load_dotenv()
 API_URL = os.environ.get("MONICA_API_URL")
 API_TOKEN = os.environ.get("MONICA_TOKEN")
 
+class MonicaAPIError(requests.exceptions.HTTPError):
+    """An HTTP error from Monica, carrying the status code and Monica's own error message."""
+    def __init__(self, status_code: int, message: str, url: str, response: Optional[requests.Response] = None):
+        super().__init__(f"Monica API error {status_code} for {url}: {message}", response=response)
+        self.status_code = status_code
+        self.message = message
+
+class _MonicaRetry(Retry):
+    """Retries idempotent requests on transient errors, and any request Monica rejected with 429."""
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 429 and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+# One pooled session for every call so keep-alive reuses the TLS connection to Monica.
+# Transient failures are retried here with backoff (honoring Retry-After), so
+# they never reach the agent and force it to re-plan the whole task.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=_MonicaRetry(
+        total=4,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    ),
+)
+# Mounted for plain http too, for self-hosted Monica instances served without TLS.
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 def configure(api_url: str, token: str):
     global API_URL, API_TOKEN
     API_URL = api_url
@@ -28,27 +70,49 @@ def get_api_url():
 
 # === Core API Helpers ===
 
-def call(endpoint: str, method: str = "GET", payload: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None, use_api_prefix: bool = True) -> Any:
-    """A helper function to make JSON requests to the Monica API."""
+def call(endpoint: str, method: str = "GET", payload: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None, use_api_prefix: bool = True, raw: bool = False) -> Any:
+    """A helper function to make JSON requests to the Monica API.
+
+    Returns the response's 'data' field, or the whole JSON body (including
+    pagination 'meta') when `raw` is True.
+    """
     api_url = get_api_url()
     base_url = api_url if use_api_prefix else api_url.replace('/api', '')
     url = f"{base_url}/{endpoint}"
     print(f"Calling {method} {url}")
     try:
-        resp = requests.request(method, url, json=payload, headers=get_headers(), params=params)
+        headers = get_headers()
+        body = None
+        if payload is not None:
+            body = orjson.dumps(payload)
+            headers["Content-Type"] = "application/json"
+        resp = _SESSION.request(method, url, data=body, headers=headers, params=params)
         resp.raise_for_status()
         if resp.status_code == 204:
             return None
-        response_json = resp.json()
+        response_json = orjson.loads(resp.content)
+        if raw:
+            return response_json
         return response_json.get("data", response_json)
     except requests.exceptions.HTTPError as http_err:
         print(f"HTTP error occurred: {http_err} for URL: {url}")
         print(f"Response Text: {resp.text}")
-        raise
+        raise MonicaAPIError(resp.status_code, _error_message(resp), f"{method} {endpoint}", response=resp) from http_err
     except Exception as err:
         print(f"An unexpected error occurred: {err}")
         raise
 
+def _error_message(resp: requests.Response) -> str:
+    """Pulls Monica's error message out of a failed response, falling back to the HTTP reason."""
+    try:
+        body = orjson.loads(resp.content)
+        error = body.get("error") if isinstance(body, dict) else None
+        if isinstance(error, dict) and error.get("message"):
+            return str(error["message"])
+    except ValueError:  # orjson.JSONDecodeError subclasses it
+        pass
+    return resp.reason or "Request failed"
+
 def upload_file(endpoint: str, filepath: str, file_key: str = "document", payload: Optional[Dict[str, Any]] = None) -> Any:
     """A flexible helper to upload files (documents, photos) to the Monica API."""
     api_url = get_api_url()
@@ -59,13 +123,128 @@ def upload_file(endpoint: str, filepath: str, file_key: str = "document", payloa
     with open(filepath, 'rb') as f:
         files = {file_key: f}
         try:
-            resp = requests.post(url, data=payload, files=files, headers=get_headers())
+            resp = _SESSION.post(url, data=payload, files=files, headers=get_headers())
             resp.raise_for_status()
-            return resp.json().get("data")
+            return orjson.loads(resp.content).get("data")
         except requests.exceptions.HTTPError as http_err:
             print(f"HTTP error occurred during upload: {http_err} for URL: {url}")
             print(f"Response Text: {resp.text}")
-            raise
+            raise MonicaAPIError(resp.status_code, _error_message(resp), f"POST {endpoint}", response=resp) from http_err
+
+def iter_all(endpoint: str, params: Optional[Dict[str, Any]] = None, limit: int = 100, max_workers: int = 8) -> Iterator[Dict[str, Any]]:
+    """Yields every item of a paginated list endpoint, in page order.
+
+    The first page is fetched on its own to learn `meta.last_page`; the
+    remaining pages are then fetched concurrently over the pooled session.
+    """
+    params = {**(params or {}), "limit": limit}
+    first_page = call(endpoint, params={**params, "page": 1}, raw=True)
+    yield from first_page.get("data", [])
+    last_page = first_page.get("meta", {}).get("last_page", 1)
+    if last_page <= 1:
+        return
+
+    def fetch_page(page: int) -> List[Dict[str, Any]]:
+        return call(endpoint, params={**params, "page": page})
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, last_page - 1)) as executor:
+        for items in executor.map(fetch_page, range(2, last_page + 1)):
+            yield from items
+
+
+# === Contact Name Cache ===
+# Maps a name whose search returned exactly one contact to that contact, so the
+# name -> id step of most agent tasks (_find_contact_by_name) can skip its API call.
+# find_people always searches. Entries expire after NAME_CACHE_TTL seconds, so
+# contacts added, renamed or deleted outside this process are picked up again;
+# create/update/delete_contact keep the cache in sync for changes made here.
+
+CONTACT_NAME_CACHE_FILE = "contact_name_cache.json"
+NAME_CACHE_TTL = 60 * 60
+_NAME_CACHE_MAX_ENTRIES = 10_000
+_name_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_name_cache_lock = threading.Lock()
+
+def _account_prefix() -> str:
+    """Namespaces cache keys per Monica account, so configure() never sees another account's IDs."""
+    return hashlib.sha256(f"{API_URL}|{API_TOKEN}".encode()).hexdigest()[:12]
+
+def _normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())
+
+def _summarize_contact(contact: Dict[str, Any]) -> Dict[str, Any]:
+    """The simplified contact shape handed to the agent (and stored in the name cache)."""
+    return {
+        "id": contact.get('id'),
+        "name": contact.get('complete_name', f"{contact.get('first_name')} {contact.get('last_name') or ''}".strip()),
+        "job": (contact.get('information') or {}).get('career', {}).get('job'),
+    }
+
+def _cached_contact(name: str) -> Optional[Dict[str, Any]]:
+    """The contact cached for `name`, or None if there is none or it has expired."""
+    key = f"{_account_prefix()}:{_normalize_name(name)}"
+    with _name_cache_lock:
+        record = _name_cache.get(key)
+        if record is None:
+            return None
+        if time.time() - record.get('cached_at', 0) > NAME_CACHE_TTL:
+            del _name_cache[key]
+            return None
+        _name_cache.move_to_end(key)
+    return {field: value for field, value in record.items() if field != 'cached_at'}
+
+def _cache_contact(name: str, contact: Dict[str, Any]) -> None:
+    key = f"{_account_prefix()}:{_normalize_name(name)}"
+    with _name_cache_lock:
+        _name_cache[key] = {**_summarize_contact(contact), 'cached_at': time.time()}
+        _name_cache.move_to_end(key)
+        while len(_name_cache) > _NAME_CACHE_MAX_ENTRIES:
+            _name_cache.popitem(last=False)
+
+# Contact fields Monica's search matches on; changing one can change what a cached name resolves to.
+_NAME_FIELDS = frozenset({"first_name", "middle_name", "last_name", "nickname"})
+
+def _uncache_name(name: str) -> None:
+    with _name_cache_lock:
+        _name_cache.pop(f"{_account_prefix()}:{_normalize_name(name)}", None)
+
+def _uncache_contact(contact_id: Optional[int] = None) -> None:
+    """Drops the names cached for `contact_id`, or all of this account's names if no id is given.
+
+    A new or renamed contact can make any cached name ambiguous, since Monica's search
+    also matches nicknames and other fields, so those changes clear the account's names.
+    """
+    prefix = f"{_account_prefix()}:"
+    with _name_cache_lock:
+        for key, record in list(_name_cache.items()):
+            if key.startswith(prefix) and (contact_id is None or record.get('id') == contact_id):
+                del _name_cache[key]
+
+def _load_name_cache() -> None:
+    """Loads the saved entries; an unreadable file or malformed entry is skipped, never fatal."""
+    try:
+        with open(CONTACT_NAME_CACHE_FILE, 'r') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(saved, dict):
+        return
+    for key, record in saved.items():
+        if isinstance(record, dict) and type(record.get('cached_at')) in (int, float):
+            _name_cache[key] = record
+
+def _save_name_cache() -> None:
+    with _name_cache_lock:
+        if not _name_cache and not os.path.exists(CONTACT_NAME_CACHE_FILE):
+            return
+        try:
+            with open(CONTACT_NAME_CACHE_FILE, 'w') as f:
+                json.dump(_name_cache, f)
+        except OSError as err:
+            print(f"Could not save the contact name cache: {err}")
+
+_load_name_cache()
+atexit.register(_save_name_cache)
 
 
 # === Account & Lookup Data (Read-Only) ===
@@ -183,6 +362,10 @@ def list_contacts(query: Optional[str] = None, page: int = 1, limit: int = 10) -
         params["query"] = query
     return call("contacts", params=params)
 
+def iter_all_contacts(query: Optional[str] = None, limit: int = 100) -> Iterator[Dict[str, Any]]:
+    """Yields every contact (optionally matching `query`) across all pages."""
+    return iter_all("contacts", params={"query": query} if query else None, limit=limit)
+
 def get_contact(contact_id: int) -> Dict[str, Any]:
     """GET /contacts/:id - Fetches a single contact by their ID.
 
@@ -237,7 +420,9 @@ def create_contact(first_name: str, **kwargs: Any) -> Dict[str, Any]:
     """
     payload = {"first_name": first_name, "is_birthdate_known": False, "is_deceased": False, "is_deceased_date_known": False}
     payload.update(kwargs)
-    return call("contacts", "POST", payload)
+    contact = call("contacts", "POST", payload)
+    _uncache_contact()
+    return contact
 
 def update_contact(contact_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
     """PUT /contacts/:id - Dynamically updates a contact's core fields.
@@ -272,7 +457,9 @@ def update_contact(contact_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
     ]
     for key in fields_to_remove:
         payload.pop(key, None)
-    return call(f"contacts/{contact_id}", "PUT", payload)
+    contact = call(f"contacts/{contact_id}", "PUT", payload)
+    _uncache_contact(None if _NAME_FIELDS.intersection(updates) else contact_id)
+    return contact
 
 def delete_contact(contact_id: int) -> Optional[Dict[str, Any]]:
     """DELETE /contacts/:id - Deletes a contact if contact id is known.
@@ -284,6 +471,7 @@ def delete_contact(contact_id: int) -> Optional[Dict[str, Any]]:
         A confirmation dictionary `{"deleted": True, "id": contact_id}`.
     """
     call(f"contacts/{contact_id}", "DELETE")
+    _uncache_contact(contact_id)
     return {"deleted": True, "id": contact_id}
 
 def set_contact_occupation(contact_id: int, job_title: str = "", company_name: str = "") -> Dict[str, Any]:
@@ -394,14 +582,14 @@ def delete_address(address_id: int) -> Dict[str, Any]:
 
 # === Contact Sub-Resources: Fields, Documents, Photos ===
 
-def set_contact_field_value(contact_id: int, field_type_id: int, data: Any) -> Dict[str, Any]:
+def set_contact_field_value(contact_id: int, field_type_id: int, data: str) -> Dict[str, Any]:
     """POST /contacts/:id/contactfields - Sets a custom field value for a contact.
 
     Args:
         contact_id (int): The ID of the contact.
         field_type_id (int): The ID of the field type (e.g., for 'Email' or 'Twitter').
                              Get this from `list_contact_field_types()`.
-        data (Any): The value for the field (e.g., 'user@example.com').
+        data (str): The value for the field (e.g., 'user@example.com').
 
     Returns:
         Dict[str, Any]: The newly created contact field object.
@@ -534,7 +722,7 @@ def delete_relationship(relationship_id: int) -> Optional[Dict[str, Any]]:
 
 # === Notes ===
 
-def list_all_notes(limit: int = None, page: int = None) -> Dict[str, Any]:
+def list_all_notes(limit: Optional[int] = None, page: Optional[int] = None) -> Dict[str, Any]:
     """GET /notes/ - List all notes in your account.
 
     Args:
@@ -569,6 +757,11 @@ def list_contact_notes(contact_id: int, limit: Optional[int] = None, page: Optio
         params['page'] = page
     return call(f"contacts/{contact_id}/notes", "GET", params=params)
 
+def iter_all_notes(contact_id: Optional[int] = None, limit: int = 100) -> Iterator[Dict[str, Any]]:
+    """Yields every note in the account, or every note of one contact, across all pages."""
+    endpoint = f"contacts/{contact_id}/notes" if contact_id else "notes"
+    return iter_all(endpoint, limit=limit)
+
 def get_note(note_id: int) -> Dict[str, Any]:
     """GET /notes/:id - Get a specific note.
 
@@ -686,9 +879,9 @@ def create_reminder(contact_id: int, title: str, next_expected_date: str, freque
         
     return call("reminders", "POST", payload)
 
-def update_reminder(reminder_id: int, title: str = None, description: str = None,
-                   next_expected_date: str = None, frequency_type: str = None,
-                   frequency_number: int = None, contact_id: int = None) -> Dict[str, Any]:
+def update_reminder(reminder_id: int, title: Optional[str] = None, description: Optional[str] = None,
+                   next_expected_date: Optional[str] = None, frequency_type: Optional[str] = None,
+                   frequency_number: Optional[int] = None, contact_id: Optional[int] = None) -> Dict[str, Any]:
     """PUT /reminders/:id - Updates an existing reminder.
 
     Note: The Monica API requires `contact_id` for updates. This wrapper makes it optional,
@@ -1295,6 +1488,11 @@ def list_calls(
     endpoint = f"contacts/{contact_id}/calls" if contact_id else "calls"
     return call(endpoint, params={"page": page, "limit": limit})
 
+def iter_all_calls(contact_id: Optional[int] = None, limit: int = 100) -> Iterator[Dict[str, Any]]:
+    """Yields every call in the account, or every call with one contact, across all pages."""
+    endpoint = f"contacts/{contact_id}/calls" if contact_id else "calls"
+    return iter_all(endpoint, limit=limit)
+
 
 def get_call(call_id: int) -> Dict[str, Any]:
     """GET /calls/:id - Gets a specific call.
@@ -1380,6 +1578,11 @@ def list_conversations(
     endpoint = f"contacts/{contact_id}/conversations" if contact_id else "conversations"
     return call(endpoint, params={"page": page, "limit": limit})
 
+def iter_all_conversations(contact_id: Optional[int] = None, limit: int = 100) -> Iterator[Dict[str, Any]]:
+    """Yields every conversation in the account, or every conversation with one contact, across all pages."""
+    endpoint = f"contacts/{contact_id}/conversations" if contact_id else "conversations"
+    return iter_all(endpoint, limit=limit)
+
 
 def get_conversation(conversation_id: int) -> Dict[str, Any]:
     """GET /conversations/:id - Gets a specific conversation, including its messages.
@@ -1538,6 +1741,10 @@ def list_companies() -> List[Dict[str, Any]]:
     """
     return call("companies")
 
+def iter_all_companies(limit: int = 100) -> Iterator[Dict[str, Any]]:
+    """Yields every company in the account across all pages."""
+    return iter_all("companies", limit=limit)
+
 def get_company(company_id: int) -> Dict[str, Any]:
     """GET /companies/:id - Gets a specific company.
 
@@ -1610,7 +1817,13 @@ def _find_contact_by_name(name: str) -> Dict[str, Any]:
     """
     Finds a single contact by name and returns a structured response.
     This is the primary lookup function used by all other functions.
+    Only the 'id' of the returned contact is guaranteed when served from the name cache.
+    Only names whose search returned a single contact are cached.
     """
+    cached = _cached_contact(name)
+    if cached is not None:
+        return {"status": "success", "data": cached}
+
     results = list_contacts(query=name)
     if not results:
         return {"status": "error", "message": f"No contact found matching '{name}'. Please use the 'remember_person' tool to create them first."}
@@ -1618,18 +1831,20 @@ def _find_contact_by_name(name: str) -> Dict[str, Any]:
     # Prioritize exact matches
     exact_matches = [c for c in results if name.lower() in c.get('complete_name', '').lower()]
     if len(exact_matches) == 1:
+        if len(results) == 1:
+            _cache_contact(name, results[0])
         return {"status": "success", "data": exact_matches[0]}
 
     if len(results) > 1:
         found_names = [f"{c.get('first_name', '')} {c.get('last_name', '')}".strip() for c in results]
         return {"status": "error", "message": f"Multiple contacts found for '{name}'. Please be more specific. Found: {', '.join(found_names)}"}
-        
+
+    _cache_contact(name, results[0])
     return {"status": "success", "data": results[0]}
 
 def _find_or_create_company(company_name: str) -> Dict[str, Any]:
     """Finds a company by name. If not found, creates it. Returns the company object."""
-    companies = list_companies()
-    for company in companies:
+    for company in iter_all_companies():
         if company['name'].lower() == company_name.lower():
             return company
     return create_company(name=company_name)
@@ -1669,16 +1884,18 @@ def remember_person(first_name: str, last_name: Optional[str] = None, nickname:
 
 def find_people(query: str) -> Dict[str, Any]:
     """Searches for contacts matching a specific name or query."""
+    # Always searches, so matches added outside this process show up; the result
+    # refreshes the name cache for _find_contact_by_name.
     contacts = list_contacts(query=query)
+    if len(contacts or []) == 1:
+        _cache_contact(query, contacts[0])
+    else:
+        _uncache_name(query)
     if not contacts:
         return {"status": "success", "data": [], "message": "No people found matching that search."}
-    
+
     # Return a simplified list for the agent to process
-    simplified_contacts = [{
-        "id": c.get('id'),
-        "name": c.get('complete_name', f"{c.get('first_name')} {c.get('last_name') or ''}".strip()),
-        "job": c.get('information', {}).get('career', {}).get('job'),
-    } for c in contacts]
+    simplified_contacts = [_summarize_contact(c) for c in contacts]
     return {"status": "success", "data": simplified_contacts}
 
 def get_details_about_person(person_name: str) -> Dict[str, Any]:
@@ -1733,7 +1950,7 @@ def log_call_with(person_name: str, description: str, date: Optional[str] = None
     if contact_result["status"] == "error":
         return contact_result
     
-    call_date = date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    call_date = date or time.strftime("%Y-%m-%d %H:%M:%S")
     call = create_call(contact_id=contact_result["data"]['id'], called_at=call_date, content=description)
     return {"status": "success", "data": call}
 
@@ -1827,4 +2044,102 @@ def tag_person(person_name: str, tags: List[str]) -> Dict[str, Any]:
         return contact_result
         
     result = set_tags_for_contact(contact_result['data']['id'], tags)
-    return {"status": "success", "data": result}
\ No newline at end of file
+    return {"status": "success", "data": result}
+
+
+# === Agent Toolset ===
+# Functions offered to the executor agent as Gemini tools, in the order they are offered.
+__tools__ = [
+    "remember_person",
+    "find_people",
+    "get_details_about_person",
+    "forget_person",
+    "remember_something_about",
+    "get_memories_about",
+    "log_call_with",
+    "set_relationship",
+    "create_task_for",
+    "mark_task_as_complete",
+    "set_reminder_for",
+    "log_job_for_person",
+    "tag_person",
+
+    "get_user",
+    "list_genders",
+    "list_currencies",
+    "list_countries",
+    "list_activity_types",
+    "list_contact_field_types",
+    "list_relationship_types",
+    "get_contact_by_name",
+    "get_contact_summary",
+    "list_contacts",
+    "get_contact",
+    "create_contact",
+    "update_contact",
+    "delete_contact",
+    "set_contact_occupation",
+    "add_address",
+    "update_address",
+    "delete_address",
+    "set_contact_field_value",
+    "upload_document_for_contact",
+    "upload_photo_for_contact",
+    "create_relationship",
+    "update_relationship",
+    "delete_relationship",
+    "list_all_notes",
+    "list_contact_notes",
+    "get_note",
+    "create_note",
+    "update_note",
+    "delete_note",
+    "create_reminder",
+    "update_reminder",
+    "delete_reminder",
+    "get_task",
+    "list_tasks",
+    "create_task",
+    "update_task",
+    "delete_task",
+    "list_debts",
+    "get_debt",
+    "create_debt",
+    "update_debt",
+    "delete_debt",
+    "list_tags",
+    "get_tag",
+    "create_tag",
+    "update_tag",
+    "delete_tag",
+    "set_tags_for_contact",
+    "unset_tags_for_contact",
+    "unset_all_tags_for_contact",
+    "list_journal_entries",
+    "get_journal_entry",
+    "create_journal_entry",
+    "update_journal_entry",
+    "delete_journal_entry",
+    "list_gifts",
+    "get_gift",
+    "create_gift",
+    "update_gift",
+    "delete_gift",
+    "list_calls",
+    "get_call",
+    "create_call",
+    "update_call",
+    "delete_call",
+    "list_conversations",
+    "get_conversation",
+    "create_conversation",
+    "update_conversation",
+    "delete_conversation",
+    "add_message_to_conversation",
+    "update_message_in_conversation",
+    "delete_message",
+    "list_companies",
+    "get_company",
+    "create_company",
+    "delete_company",
+]
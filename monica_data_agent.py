@@ -1,10 +1,176 @@
 # monica_data_agent.py
 import os
-import json
+import re
+import inspect
+import logging
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Tuple
 from google import genai
 from google.genai import types
 import monica_api_caller as alf
 
+log = logging.getLogger(__name__)
+
+def _public_functions(module) -> Tuple[Callable, ...]:
+    """
+    Returns the functions a module offers as tools: the names in its `__tools__`
+    allowlist if it has one, otherwise every public function defined in it.
+    """
+    allowlist = getattr(module, "__tools__", None)
+    if allowlist is not None:
+        return tuple(getattr(module, name) for name in allowlist)
+    return tuple(
+        fn for name, fn in inspect.getmembers(module, inspect.isfunction)
+        if fn.__module__ == module.__name__ and not name.startswith("_")
+    )
+
+def _declare(tools: Tuple[Callable, ...]) -> types.Tool:
+    """
+    Converts the tool functions into Gemini function declarations. Passing this
+    prebuilt Tool instead of the raw functions saves the SDK from re-inspecting
+    every signature and docstring on each request.
+    """
+    return types.Tool(function_declarations=[
+        types.FunctionDeclaration.from_callable_with_api_option(callable=fn, api_option="GEMINI_API")
+        for fn in tools
+    ])
+
+_Toolset = Tuple[Tuple[Callable, ...], Dict[str, Callable], types.Tool]
+_TOOLSETS: Dict[tuple, _Toolset] = {}
+
+def _toolset(tool_modules) -> _Toolset:
+    """Builds (and caches) the tools, name->function dispatch dict and declarations for a set of modules."""
+    tool_modules = tuple(tool_modules)
+    if tool_modules not in _TOOLSETS:
+        tools = tuple(fn for module in tool_modules for fn in _public_functions(module))
+        _TOOLSETS[tool_modules] = (tools, {tool.__name__: tool for tool in tools}, _declare(tools))
+    return _TOOLSETS[tool_modules]
+
+# --- The toolset from our agent-level functions library, built once per process ---
+DEFAULT_TOOL_MODULES = (alf,)
+_TOOLS, _DISPATCH, _TOOL_DECLARATIONS = _toolset(DEFAULT_TOOL_MODULES)
+
+# Upper bound on model <-> tool round trips per task, same as the SDK's automatic function calling.
+_MAX_TOOL_ROUNDS = 10
+# Upper bound on function calls from a single model turn that run at once.
+_MAX_PARALLEL_TOOL_CALLS = 8
+
+# Tools offered for every task: most actions start by looking the person up.
+_CORE_TOOLS = (
+    "remember_person", "find_people", "get_details_about_person", "forget_person",
+    "get_contact_by_name", "get_contact_summary", "list_contacts", "get_contact", "get_user",
+)
+
+# Coarse intent groups. A task mentioning any of a group's keywords is offered
+# that group's tools on top of the core ones, instead of all ~90 declarations.
+_TOOL_GROUPS = {
+    "profile": (
+        re.compile(r"\b(contact|profile|address|email|phone|birthday|born|gender|nickname|deceased|died|field|photo|document|upload|update|rename)", re.IGNORECASE),
+        ("create_contact", "update_contact", "delete_contact", "list_genders", "list_countries",
+         "add_address", "update_address", "delete_address", "set_contact_field_value",
+         "list_contact_field_types", "upload_document_for_contact", "upload_photo_for_contact"),
+    ),
+    "work": (
+        re.compile(r"\b(job|work|company|companies|employ|occupation|career|title)", re.IGNORECASE),
+        ("log_job_for_person", "set_contact_occupation", "list_companies", "get_company", "create_company", "delete_company"),
+    ),
+    "relationship": (
+        re.compile(r"\b(relat|friend|partner|wife|husband|spouse|brother|sister|sibling|mother|father|mom|dad|parent|child|son|daughter|cousin|colleague|boss)", re.IGNORECASE),
+        ("set_relationship", "create_relationship", "update_relationship", "delete_relationship", "list_relationship_types"),
+    ),
+    "note": (
+        re.compile(r"\b(note|remember|memor|fact|told|said|like|love|hate|met)", re.IGNORECASE),
+        ("remember_something_about", "get_memories_about", "list_all_notes", "list_contact_notes",
+         "get_note", "create_note", "update_note", "delete_note"),
+    ),
+    "call": (
+        re.compile(r"\b(call|phoned|rang|spoke|talked|activit)", re.IGNORECASE),
+        ("log_call_with", "list_calls", "get_call", "create_call", "update_call", "delete_call", "list_activity_types"),
+    ),
+    "conversation": (
+        re.compile(r"\b(conversation|message|chat|text|sms|whatsapp|email)", re.IGNORECASE),
+        ("list_conversations", "get_conversation", "create_conversation", "update_conversation",
+         "delete_conversation", "add_message_to_conversation", "update_message_in_conversation", "delete_message"),
+    ),
+    "task": (
+        re.compile(r"\b(task|todo|to-do|to do|complete|done|finish)", re.IGNORECASE),
+        ("create_task_for", "mark_task_as_complete", "get_task", "list_tasks", "create_task", "update_task", "delete_task"),
+    ),
+    "reminder": (
+        re.compile(r"\b(remind|birthday|anniversar|every (day|week|month|year)|next (week|month|year)|tomorrow)", re.IGNORECASE),
+        ("set_reminder_for", "create_reminder", "update_reminder", "delete_reminder"),
+    ),
+    "debt": (
+        re.compile(r"\b(debt|owe|lent|lend|borrow|loan|money|pay|paid|dollar|euro|rupee|currenc)|[$€£₹]", re.IGNORECASE),
+        ("list_debts", "get_debt", "create_debt", "update_debt", "delete_debt", "list_currencies"),
+    ),
+    "tag": (
+        re.compile(r"\b(tag|label|categor)", re.IGNORECASE),
+        ("tag_person", "list_tags", "get_tag", "create_tag", "update_tag", "delete_tag",
+         "set_tags_for_contact", "unset_tags_for_contact", "unset_all_tags_for_contact"),
+    ),
+    "journal": (
+        re.compile(r"\b(journal|diary|entry|entries|my day)", re.IGNORECASE),
+        ("list_journal_entries", "get_journal_entry", "create_journal_entry", "update_journal_entry", "delete_journal_entry"),
+    ),
+    "gift": (
+        re.compile(r"\b(gift|present|bought|buy)", re.IGNORECASE),
+        ("list_gifts", "get_gift", "create_gift", "update_gift", "delete_gift"),
+    ),
+}
+
+def _select_groups(task_prompt: str) -> Tuple[str, ...]:
+    """Names of the tool groups whose keywords appear in the task, in `_TOOL_GROUPS` order."""
+    return tuple(name for name, (pattern, _) in _TOOL_GROUPS.items() if pattern.search(task_prompt))
+
+# Filtered declarations, built once per combination of groups.
+_GROUP_DECLARATIONS: Dict[Tuple[str, ...], types.Tool] = {}
+
+def _group_declarations(groups: Tuple[str, ...]) -> types.Tool:
+    """The core tools plus the given groups' tools, picked from the prebuilt default declarations."""
+    if groups not in _GROUP_DECLARATIONS:
+        names = set(_CORE_TOOLS).union(*(_TOOL_GROUPS[group][1] for group in groups))
+        _GROUP_DECLARATIONS[groups] = types.Tool(function_declarations=[
+            declaration for declaration in _TOOL_DECLARATIONS.function_declarations if declaration.name in names
+        ])
+    return _GROUP_DECLARATIONS[groups]
+
+SYSTEM_INSTRUCTION = """You are a data execution engine. Your only job is to execute functions based on the user's request.
+            - You must use the provided tools to fulfill the request. Use alf tools for Monica Agent-Level Functions (ALF).
+            - If you dont know something, you can call the relevent functions to gather information.
+            - 'get_' functions are used when you know specifics about the entity(like ID), 'list_' functions are used when you dont know the exact details.
+            - To find a contact's ID for an action (like adding a note), ALWAYS use the 'find_people' tool first if the ID is not provided. The only exception is 'remember_person'.
+            - If the user's request is ambiguous, make a best effort to call the most relevant tool.
+            - You do not hold conversations. Your output is only the direct result from the function call.
+            - If you determine that no tool is appropriate for the given task, return a JSON object: {"status": "error", "message": "No suitable tool found for the request."}
+            - Finally, If there is the task prompt and the tool result, summarize the result in a natural language response in a way that completely answers the task prompt, also provide additional information if deemed useful.
+            """
+
+DEFAULT_LITE_MODEL_NAME = "gemini-flash-lite-latest"
+
+# Short, single-action tasks that the lighter model handles reliably.
+_LITE_PATTERNS = (
+    re.compile(r"^(forget|delete|remove)\s", re.IGNORECASE),
+    re.compile(r"^(remember|create|add)\s+\w+", re.IGNORECASE),
+    re.compile(r"^(get|find|list|look up)\s", re.IGNORECASE),
+)
+_COMPOUND_TASK = re.compile(r"\b(and|then|also)\b|[;,]", re.IGNORECASE)
+_LITE_MAX_TASK_LENGTH = 120
+
+def _is_simple_task(task_prompt: str) -> bool:
+    """Returns True for short, single-action tasks that can go to the lite model."""
+    task_prompt = task_prompt.strip()
+    if len(task_prompt) > _LITE_MAX_TASK_LENGTH or _COMPOUND_TASK.search(task_prompt):
+        return False
+    return any(pattern.match(task_prompt) for pattern in _LITE_PATTERNS)
+
+# One client per API key, shared by every agent constructed with that key.
+_CLIENTS: Dict[str, genai.Client] = {}
+# Connections only need warming once per process, not once per agent.
+_WARMED_UP = False
+
 class MonicaDataAgent:
     """
     A stateless, non-conversational Executor Agent.
@@ -12,12 +178,14 @@ class MonicaDataAgent:
     function call to the Monica Agent-Level Functions (ALF), execute it, and
     return the raw JSON result. It uses Gemini's native function-calling.
     """
-    def __init__(self, api_key: str = None, model_name: str = None, monica_api_url: str = None, monica_token: str = None):
+    def __init__(self, api_key: str = None, model_name: str = None, monica_api_url: str = None, monica_token: str = None, lite_model_name: str = None, tool_modules: tuple = DEFAULT_TOOL_MODULES, prewarm: bool = True):
         api_key = api_key or os.environ.get("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("Gemini API key is required. Provide it as an argument or set GEMINI_API_KEY.")
 
-        self.client = genai.Client(api_key=api_key)
+        if api_key not in _CLIENTS:
+            _CLIENTS[api_key] = genai.Client(api_key=api_key)
+        self.client = _CLIENTS[api_key]
         
         # Configure Monica API caller if credentials are provided
         if monica_api_url and monica_token:
@@ -25,170 +193,165 @@ class MonicaDataAgent:
         elif os.environ.get("MONICA_API_URL") and os.environ.get("MONICA_TOKEN"):
             alf.configure(api_url=os.environ.get("MONICA_API_URL"), token=os.environ.get("MONICA_TOKEN"))
 
-        # --- Define the toolset from our agent-level functions library ---
-        self.tools = [
-            alf.remember_person,
-            alf.find_people,
-            alf.get_details_about_person,
-            alf.forget_person,
-            alf.remember_something_about,
-            alf.get_memories_about,
-            alf.log_call_with,
-            alf.set_relationship,
-            alf.create_task_for,
-            alf.mark_task_as_complete,
-            alf.set_reminder_for,
-            alf.log_job_for_person,
-            alf.tag_person,
-                 
-            alf.get_user,
-            alf.list_genders,
-            alf.list_currencies,
-            alf.list_countries,
-            alf.list_activity_types,
-            alf.list_contact_field_types,
-            alf.list_relationship_types,
-            alf.get_contact_by_name,
-            alf.get_contact_summary,
-            alf.list_contacts,
-            alf.get_contact,
-            alf.create_contact,
-            alf.update_contact,
-            alf.delete_contact,
-            alf.set_contact_occupation,
-            alf.add_address,
-            alf.update_address,
-            alf.delete_address,
-            alf.set_contact_field_value,
-            alf.upload_document_for_contact,
-            alf.upload_photo_for_contact,
-            alf.create_relationship,
-            alf.update_relationship,
-            alf.delete_relationship,
-            alf.list_all_notes,
-            alf.list_contact_notes,
-            alf.get_note,
-            alf.create_note,
-            alf.update_note,
-            alf.delete_note,
-            alf.create_reminder,
-            alf.update_reminder,
-            alf.delete_reminder,
-            alf.get_task,
-            alf.list_tasks,
-            alf.create_task,
-            alf.update_task,
-            alf.delete_task,
-            alf.list_debts,
-            alf.get_debt,
-            alf.create_debt,
-            alf.update_debt,
-            alf.delete_debt,
-            alf.list_tags,
-            alf.get_tag,
-            alf.create_tag,
-            alf.update_tag,
-            alf.delete_tag,
-            alf.set_tags_for_contact,
-            alf.unset_tags_for_contact,
-            alf.unset_all_tags_for_contact,
-            alf.list_journal_entries,
-            alf.get_journal_entry,
-            alf.create_journal_entry,
-            alf.update_journal_entry,
-            alf.delete_journal_entry,
-            alf.list_gifts,
-            alf.get_gift,
-            alf.create_gift,
-            alf.update_gift,
-            alf.delete_gift,
-            alf.list_calls,
-            alf.get_call,
-            alf.create_call,
-            alf.update_call,
-            alf.delete_call,
-            alf.list_conversations,
-            alf.get_conversation,
-            alf.create_conversation,
-            alf.update_conversation,
-            alf.delete_conversation,
-            alf.add_message_to_conversation,
-            alf.update_message_in_conversation,
-            alf.delete_message,
-            alf.list_companies,
-            alf.get_company,
-            alf.create_company,
-            alf.delete_company,
-        ]
-
+        self.tools, self._dispatch, self._tool_declarations = _toolset(tool_modules)
         self.model_name = model_name or os.environ.get("GEMINI_MODEL_NAME")
-        self.system_instruction="""You are a data execution engine. Your only job is to execute functions based on the user's request.
-            - You must use the provided tools to fulfill the request. Use alf tools for Monica Agent-Level Functions (ALF).
-            - If you dont know something, you can call the relevent functions to gather information.
-            - 'get_' functions are used when you know specifics about the entity(like ID), 'list_' functions are used when you dont know the exact details.
-            - To find a contact's ID for an action (like adding a note), ALWAYS use the 'find_people' tool first if the ID is not provided. The only exception is 'remember_person'.
-            - If the user's request is ambiguous, make a best effort to call the most relevant tool.
-            - You do not hold conversations. Your output is only the direct result from the function call.
-            - If you determine that no tool is appropriate for the given task, return a JSON object: {"status": "error", "message": "No suitable tool found for the request."}
-            - Finally, If there is the task prompt and the tool result, summarize the result in a natural language response in a way that completely answers the task prompt, also provide additional information if deemed useful.
-            """
+        self.lite_model_name = lite_model_name or os.environ.get("GEMINI_LITE_MODEL_NAME") or DEFAULT_LITE_MODEL_NAME
+        self.system_instruction = SYSTEM_INSTRUCTION
+        self.config = types.GenerateContentConfig(
+            tools=[self._tool_declarations],
+            system_instruction=self.system_instruction,
+        )
+
+        # Warm up in the background so construction stays fast.
+        global _WARMED_UP
+        if prewarm and not _WARMED_UP:
+            _WARMED_UP = True
+            threading.Thread(target=self.warmup, daemon=True).start()
+
+    def warmup(self):
+        """
+        Opens the pooled connections to Monica and Gemini ahead of the first task,
+        so the first request does not pay for the TLS handshakes and the auth round trip.
+        Failures are only logged; a real request will surface them properly.
+        """
+        try:
+            alf.get_user()
+        except Exception as e:
+            log.warning("Monica warmup failed: %s", e)
+        if self.model_name:
+            try:
+                self.client.models.get(model=self.model_name)
+            except Exception as e:
+                log.warning("Gemini warmup failed: %s", e)
 
     def execute_task(self, task_prompt: str) -> str:
         """
         Takes a single, precise task prompt, executes the appropriate tool,
         and returns the direct output from the tool as a JSON string.
         """
-        print(f"  [Executor Agent] Received task: '{task_prompt}'")
+        return "".join(self.execute_task_stream(task_prompt))
+
+    def execute_task_stream(self, task_prompt: str) -> Iterator[str]:
+        """
+        Same as `execute_task`, but yields the final response in chunks as the
+        model produces them, so callers can show the first words right away.
+        Tool selection itself is not streamed, since it needs the full function call.
+        If an error cuts the response short, the error follows the partial text as
+        a separate marker instead of being run into it.
+        """
+        log.info("Received task: '%s'", task_prompt)
+        yielded = False
         try:
+            for chunk in self._stream_task(task_prompt):
+                yielded = True
+                yield chunk
+        except Exception as e:
+            log.exception("An unexpected error occurred in the Executor Agent: %s", e)
+            if yielded:
+                yield f"\n\n[Error: the response above is incomplete: {e}]"
+            else:
+                yield f"I'm sorry, but an error occurred while processing your request: {e}"
+
+    def _stream_task(self, task_prompt: str) -> Iterator[str]:
+        """The body of `execute_task_stream`, left to raise so the caller knows whether output was already sent."""
+        contents = [types.Content(role="user", parts=[types.Part.from_text(text=task_prompt)])]
+
+        # Route obvious single-action tasks to the cheaper model, and fall
+        # back to the main model if it does not manage to pick a tool.
+        # Likewise offer only the tool groups the task mentions, falling back to all of them.
+        model_name = self.lite_model_name if _is_simple_task(task_prompt) else self.model_name
+        config = self._config_for(task_prompt)
+        response = self.client.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=config,
+        )
+        if not response.function_calls and (model_name != self.model_name or config is not self.config):
+            log.info("%s did not select a tool, retrying with %s and the full toolset", model_name, self.model_name)
+            model_name, config = self.model_name, self.config
             response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=task_prompt,
-                config=types.GenerateContentConfig(
-                    tools=self.tools,
-                    system_instruction=self.system_instruction,
-                )
+                model=model_name,
+                contents=contents,
+                config=config,
             )
-            
-            # The model has decided to call a function
-            if not response.function_calls:
-                return response.text
-                
-            fc = response.function_calls[0]
-            tool_name = fc.name
-            tool_args = {key: value for key, value in fc.args.items()}
-
-            print(f"  [Executor Agent] AI selected tool: {tool_name} with args: {tool_args}")
-
-            # --- Dynamically call the selected function from the ALF module ---
-            tool_function = getattr(alf, tool_name)
-            tool_result = tool_function(**tool_args)
 
-            print(f"  [Executor Agent] Tool result: {json.dumps(tool_result, default=str)}")
+        # The model answered without calling a function
+        if not response.function_calls:
+            if response.text:
+                yield response.text
+            return
 
-            
-            # --- Construct a new prompt to ask the LLM to summarize the result ---
-            summarization_prompt = (
-                f"Original task: '{task_prompt}'\n"
-                f"Result from the executed tool: {json.dumps(tool_result, default=str)}\n\n"
-                "Based on the tool result, please provide a natural language response that directly answers the original task."
-            )
-            
-            final_response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=summarization_prompt
-            )
-            
-            return final_response.text
+        function_calls = response.function_calls
+        model_content = response.candidates[0].content
+        # Feed tool results back until the model answers in text (e.g. find_people, then the action).
+        for _ in range(_MAX_TOOL_ROUNDS):
+            contents.append(model_content)
+            contents.append(types.Content(role="user", parts=self._run_tools(function_calls)))
+
+            function_calls, parts = [], []
+            for chunk in self.client.models.generate_content_stream(
+                model=model_name,
+                contents=contents,
+                config=config,
+            ):
+                if chunk.candidates and chunk.candidates[0].content:
+                    parts.extend(chunk.candidates[0].content.parts or [])
+                if chunk.function_calls:
+                    function_calls.extend(chunk.function_calls)
+                elif chunk.text:
+                    yield chunk.text
+            if not function_calls:
+                return
+            model_content = types.Content(role="model", parts=parts)
+
+        yield f"I'm sorry, but the request needed more than {_MAX_TOOL_ROUNDS} tool calls to complete."
 
+    def _config_for(self, task_prompt: str) -> types.GenerateContentConfig:
+        """A config offering only the core tools and the groups the task mentions, or `self.config` if none match."""
+        groups = _select_groups(task_prompt)
+        if not groups or self.tools is not _TOOLS:
+            return self.config
+        return types.GenerateContentConfig(
+            tools=[_group_declarations(groups)],
+            system_instruction=self.system_instruction,
+        )
+
+    def _run_tools(self, function_calls: List[types.FunctionCall]) -> List[types.Part]:
+        """
+        Runs every function call from one model turn. Calls in the same turn are
+        independent, so several are run concurrently and the turn takes as long
+        as its slowest call; results keep the order the model asked for them in.
+        """
+        if len(function_calls) == 1:
+            return [self._run_tool(function_calls[0])]
+        with ThreadPoolExecutor(max_workers=min(len(function_calls), _MAX_PARALLEL_TOOL_CALLS)) as executor:
+            return list(executor.map(self._run_tool, function_calls))
+
+    def _run_tool(self, fc: types.FunctionCall) -> types.Part:
+        """Runs one function call from the model and wraps its result as a function response part."""
+        tool_args = dict(fc.args or {})
+        log.info("AI selected tool: %s with args: %s", fc.name, tool_args)
+
+        # --- Look up the selected function in the registered toolset ---
+        tool_function = self._dispatch.get(fc.name)
+        try:
+            if tool_function is None:
+                raise ValueError(f"The model selected an unknown tool: '{fc.name}'")
+            tool_result = tool_function(**tool_args)
         except Exception as e:
-            error_message = f"An unexpected error occurred in the Executor Agent: {e}"
-            print(f"  [Executor Agent] Error: {error_message}")
-            return f"I'm sorry, but an error occurred while processing your request: {e}"
+            # Reported back to the model, so it can correct itself instead of failing the task.
+            tool_result = {"status": "error", "message": str(e)}
+
+        tool_result_json = orjson.dumps(tool_result, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        # Full results can be megabytes for list endpoints, so they are only logged at DEBUG.
+        log.debug("Tool result: %s", tool_result_json)
+        return types.Part.from_function_response(name=fc.name, response={"result": tool_result_json})
 
 # --- Local Testing ---
 if __name__ == "__main__":
     from dotenv import load_dotenv
     load_dotenv()
+    logging.basicConfig(level=logging.INFO)
     
     gemini_key = os.environ.get("GEMINI_API_KEY")
     if not gemini_key:
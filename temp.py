@@ -1,12 +1,27 @@
 import os
+import time
+import atexit
+import threading
+import logging
+import orjson
 import dotenv
 import requests
+from functools import lru_cache, wraps
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Literal, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Literal, Tuple, Union
 
 # --- Configuration & Initialization ---
 dotenv.load_dotenv()
 
+log = logging.getLogger(__name__)
+# How much of a failed response's body goes into the error log.
+ERROR_BODY_LIMIT = 512
+
 API_URL = os.environ.get("MONICA_API_URL")
 API_TOKEN = os.environ.get("MONICA_TOKEN")
 
@@ -15,80 +30,436 @@ if not API_URL or not API_TOKEN:
 
 HEADERS = {"Authorization": f"Bearer {API_TOKEN}", "Accept": "application/json"}
 
+# One pooled session for every call, so keep-alive reuses the TLS connection to Monica.
+# pool_block makes concurrent callers (batch(), prefetch_lookups(), test cleanup) wait for a
+# free keep-alive connection instead of opening throwaway ones past pool_maxsize.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=1,  # Every call goes to the one Monica host.
+    pool_maxsize=20,
+    pool_block=True,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504], raise_on_status=False),
+)
+# Mounted for plain http too, for self-hosted Monica instances served without TLS.
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+
+# Base URLs resolved once: the API root, and the site root for the few non-/api endpoints.
+_API_BASE = f"{API_URL}/"
+_SITE_BASE = f"{API_URL.replace('/api', '')}/"
+# Seconds to wait for Monica to respond before giving up on a call.
+REQUEST_TIMEOUT = 10
+
+# Conditional GETs: (url, params) -> (ETag, data) for the most recent ETAG_CACHE_SIZE reads.
+# A 304 Not Modified answer is served from here instead of re-transferring the body.
+ETAG_CACHE_SIZE = 256
+_etag_cache: "OrderedDict[tuple, Tuple[str, Any]]" = OrderedDict()
+_etag_lock = threading.Lock()
+
+def close():
+    """Closes the pooled session and its open connections."""
+    SESSION.close()
+
+atexit.register(close)
+
+# ETag entries for these lookup endpoints are kept on disk between runs, so a fresh
+# process can revalidate them with a 304 instead of downloading them again.
+ETAG_CACHE_FILE = "etag_cache.json"
+_PERSISTED_ETAG_URLS = frozenset(_API_BASE + endpoint for endpoint in (
+    "genders", "currencies", "countries", "activitytypes", "contactfieldtypes", "relationshiptypes",
+))
+
+def _load_etag_cache():
+    """Loads the saved entries; an unreadable file or malformed entry is skipped, never fatal."""
+    try:
+        with open(ETAG_CACHE_FILE, "rb") as f:
+            entries = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return
+    if not isinstance(entries, list):
+        return
+    for entry in entries:
+        try:
+            url, params, etag, data = entry
+            _etag_cache[(url, tuple(tuple(param) for param in params))] = (etag, data)
+        except (TypeError, ValueError):
+            continue
+
+def _save_etag_cache():
+    with _etag_lock:
+        entries = [
+            [url, params, etag, data]
+            for (url, params), (etag, data) in _etag_cache.items()
+            if url in _PERSISTED_ETAG_URLS
+        ]
+    if not entries:
+        return
+    tmp_file = f"{ETAG_CACHE_FILE}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(orjson.dumps(entries))
+        os.replace(tmp_file, ETAG_CACHE_FILE)
+    except OSError as err:
+        log.warning("Could not save the ETag cache: %s", err)
+
+_load_etag_cache()
+atexit.register(_save_etag_cache)
+
+# Client-side token bucket sized to Monica's default limit of 60 requests a minute. Bursts
+# from batch() and prefetch_lookups() wait here instead of drawing 429s and retry backoff.
+RATE_LIMIT = 60
+RATE_PERIOD = 60.0
+_rate_tokens = float(RATE_LIMIT)
+_rate_stamp = time.monotonic()
+# Monotonic time before which no tokens are handed out, set when the server reports
+# an exhausted quota along with the time it resets.
+_rate_blocked_until = 0.0
+_rate_lock = threading.Lock()
+
+def _take_rate_token():
+    """Blocks until the bucket has a token for one more request, then spends it.
+
+    The wait is worked out under the lock but slept outside it, so responses can
+    still update the bucket while requesters are waiting.
+    """
+    global _rate_tokens, _rate_stamp
+    while True:
+        with _rate_lock:
+            now = time.monotonic()
+            if now < _rate_blocked_until:
+                wait = _rate_blocked_until - now
+            else:
+                _rate_tokens = min(RATE_LIMIT, _rate_tokens + (now - _rate_stamp) * RATE_LIMIT / RATE_PERIOD)
+                _rate_stamp = now
+                if _rate_tokens >= 1:
+                    _rate_tokens -= 1
+                    return
+                wait = (1 - _rate_tokens) * RATE_PERIOD / RATE_LIMIT
+        time.sleep(wait)
+
+def _seconds_until_reset(resp: requests.Response) -> Optional[float]:
+    """Seconds until the quota resets, from X-RateLimit-Reset (a Unix time) or else Retry-After."""
+    reset = resp.headers.get("X-RateLimit-Reset")
+    if reset and reset.isdigit():
+        return max(0.0, int(reset) - time.time())
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return None
+
+def _sync_rate_limit(resp: requests.Response):
+    """Lowers the bucket to the server's X-RateLimit-Remaining when that is the tighter count.
+
+    Once the quota is used up, no token is handed out again before the server's reset time.
+    """
+    global _rate_tokens, _rate_stamp, _rate_blocked_until
+    remaining = resp.headers.get("X-RateLimit-Remaining")
+    if remaining is None or not remaining.isdigit():
+        return
+    reset_in = _seconds_until_reset(resp) if remaining == "0" else None
+    with _rate_lock:
+        _rate_tokens = min(_rate_tokens, float(remaining))
+        if reset_in is not None:
+            _rate_blocked_until = max(_rate_blocked_until, time.monotonic() + reset_in)
+            # Refilling starts from the reset, not from now.
+            _rate_stamp = max(_rate_stamp, _rate_blocked_until)
+
 
 # === Core API Helpers ===
 
-def call(endpoint: str, method: str = "GET", payload: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None, use_api_prefix: bool = True) -> Any:
-    """A helper function to make JSON requests to the Monica API."""
-    base_url = API_URL if use_api_prefix else API_URL.replace('/api', '')
-    url = f"{base_url}/{endpoint}"
+def call(endpoint: str, method: str = "GET", payload: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None, use_api_prefix: bool = True, raw: bool = False) -> Any:
+    """A helper function to make JSON requests to the Monica API.
+
+    GETs are revalidated with If-None-Match when an earlier response carried an ETag.
+    The payload is encoded once with orjson; urllib3 retries re-send those same bytes.
+    With `raw`, the whole response body (including 'meta') is returned uncached
+    instead of just its 'data'.
+    """
+    url = (_API_BASE if use_api_prefix else _SITE_BASE) + endpoint
     print(f"Calling {method} {url}")
+    cache_key = cached = headers = body = None
+    if payload is not None:
+        body = orjson.dumps(payload)
+        headers = {"Content-Type": "application/json"}
+    if method == "GET" and not raw:
+        cache_key = (url, tuple(sorted(params.items())) if params else ())
+        with _etag_lock:
+            cached = _etag_cache.get(cache_key)
+        if cached is not None:
+            headers = {**(headers or {}), "If-None-Match": cached[0]}
     try:
-        resp = requests.request(method, url, json=payload, headers=HEADERS, params=params)
+        _take_rate_token()
+        resp = SESSION.request(method, url, data=body, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        _sync_rate_limit(resp)
         resp.raise_for_status()
-        if resp.status_code == 204:
+        if resp.status_code == 304 and cached is not None:
+            with _etag_lock:
+                if cache_key in _etag_cache:
+                    _etag_cache.move_to_end(cache_key)
+            return cached[1]
+        # Deletes often answer 200 with an empty body; there is nothing to decode then.
+        if resp.status_code == 204 or not resp.content:
             return None
-        response_json = resp.json()
-        return response_json.get("data", response_json)
-    except requests.exceptions.HTTPError as http_err:
-        print(f"HTTP error occurred: {http_err} for URL: {url}")
-        print(f"Response Text: {resp.text}")
+        response_json = orjson.loads(resp.content)
+        if raw:
+            return response_json
+        data = response_json.get("data", response_json) if isinstance(response_json, dict) else response_json
+        etag = resp.headers.get("ETag")
+        if cache_key is not None and etag:
+            with _etag_lock:
+                _etag_cache[cache_key] = (etag, data)
+                _etag_cache.move_to_end(cache_key)
+                while len(_etag_cache) > ETAG_CACHE_SIZE:
+                    _etag_cache.popitem(last=False)
+        return data
+    except requests.exceptions.HTTPError:
+        if log.isEnabledFor(logging.ERROR):
+            log.error("HTTP %s on %s %s: %s", resp.status_code, method, url, resp.text[:ERROR_BODY_LIMIT])
         raise
     except Exception as err:
-        print(f"An unexpected error occurred: {err}")
+        log.error("Unexpected error on %s %s: %s", method, url, err)
         raise
 
 def upload_file(endpoint: str, filepath: str, file_key: str = "document", payload: Optional[Dict[str, Any]] = None) -> Any:
-    """A flexible helper to upload files (documents, photos) to the Monica API."""
-    url = f"{API_URL}/{endpoint}"
+    """A flexible helper to upload files (documents, photos) to the Monica API.
+
+    The multipart body is streamed from disk, so large files are never held in memory whole.
+    """
+    url = _API_BASE + endpoint
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"The file was not found at {filepath}")
 
     with open(filepath, 'rb') as f:
-        files = {file_key: f}
+        fields = {key: str(value) for key, value in (payload or {}).items()}
+        fields[file_key] = (os.path.basename(filepath), f, "application/octet-stream")
+        encoder = MultipartEncoder(fields=fields)
         try:
-            resp = requests.post(url, data=payload, files=files, headers=HEADERS)
+            _take_rate_token()
+            resp = SESSION.post(url, data=encoder, headers={"Content-Type": encoder.content_type})
+            _sync_rate_limit(resp)
             resp.raise_for_status()
-            return resp.json().get("data")
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP error occurred during upload: {http_err} for URL: {url}")
-            print(f"Response Text: {resp.text}")
+            return orjson.loads(resp.content).get("data")
+        except requests.exceptions.HTTPError:
+            if log.isEnabledFor(logging.ERROR):
+                log.error("HTTP %s on upload to %s: %s", resp.status_code, url, resp.text[:ERROR_BODY_LIMIT])
             raise
 
+def iter_pages(endpoint: str, limit: int = 100, **params: Any) -> Iterator[Dict[str, Any]]:
+    """Yields every item of a paginated list endpoint, page by page.
+
+    The next page is fetched in the background while the caller works through the
+    current one. Iteration stops at the first page with fewer than `limit` items.
+    None-valued params are left out.
+    """
+    params = {key: value for key, value in params.items() if value is not None}
+
+    def fetch(page: int) -> List[Dict[str, Any]]:
+        return call(endpoint, params={**params, "page": page, "limit": limit}) or []
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page = 1
+        upcoming = executor.submit(fetch, page)
+        while True:
+            items = upcoming.result()
+            if len(items) >= limit:
+                page += 1
+                upcoming = executor.submit(fetch, page)
+            yield from items
+            if len(items) < limit:
+                return
+
+def count_items(endpoint: str, **params: Any) -> int:
+    """Returns how many items a paginated list endpoint holds, read from a one-item page's meta.total.
+
+    None-valued params are left out.
+    """
+    params = {key: value for key, value in params.items() if value is not None}
+    return call(endpoint, params={**params, "limit": 1}, raw=True)["meta"]["total"]
+
+class Ref:
+    """Placeholder in a `batch()` operation's arguments for a field of another operation's result."""
+    def __init__(self, name: str, key: str = "id"):
+        self.name = name
+        self.key = key
+
+def _resolve(value: Any, results: Dict[str, Any]) -> Any:
+    return results[value.name][value.key] if isinstance(value, Ref) else value
+
+def batch(ops: Dict[str, tuple], results: Optional[Dict[str, Any]] = None, max_workers: int = 6) -> Dict[str, Any]:
+    """Runs a set of possibly dependent calls, each independent layer concurrently.
+
+    `ops` maps a name to `(function, args)` or `(function, args, kwargs)`. A `Ref(name)`
+    among the top-level arguments waits for that operation and is replaced by its
+    result's 'id' (or `key`). Calls whose references are all resolved run together,
+    so N calls take as many round trips as the dependency chain is deep.
+
+    Results are stored in `results` (a new dict by default) as each layer finishes.
+    If a call fails, the rest of its layer still completes and is recorded before the
+    first error is raised, so the caller can clean up whatever was created.
+    """
+    results = {} if results is None else results
+    pending = {name: (op + ({},))[:3] for name, op in ops.items()}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending:
+            layer = [
+                name for name, (_, args, kwargs) in pending.items()
+                if all(value.name in results for value in (*args, *kwargs.values()) if isinstance(value, Ref))
+            ]
+            if not layer:
+                raise ValueError(f"batch() operations reference results that never arrive: {sorted(pending)}")
+            futures = {}
+            for name in layer:
+                function, args, kwargs = pending.pop(name)
+                futures[name] = executor.submit(
+                    function,
+                    *(_resolve(value, results) for value in args),
+                    **{key: _resolve(value, results) for key, value in kwargs.items()},
+                )
+            errors = []
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as err:
+                    errors.append(err)
+            if errors:
+                raise errors[0]
+    return results
+
+def _make_deleter(name: str, resource: str, param: str, doc: str):
+    """Generates `name(param)`: DELETE /resource/:id, then return {"deleted": True, "id": ...}.
+
+    The function is compiled from source with the endpoint prefix baked in as a constant,
+    so it keeps a real keyword parameter and resolves `call` through this module at call time.
+    """
+    source = (
+        f"def {name}({param}: int) -> Dict[str, Any]:\n"
+        f"    call({resource + '/'!r} + str({param}), 'DELETE')\n"
+        f"    return {{'deleted': True, 'id': {param}}}\n"
+    )
+    namespace = {}
+    exec(source, globals(), namespace)
+    deleter = namespace[name]
+    deleter.__doc__ = doc
+    return deleter
+
+# Seconds before account-editable lookups (field types, relationship types, tags) are refetched.
+LOOKUP_TTL = 300
+
+def _ttl_cache(seconds: float):
+    """Like `lru_cache`, but each result expires after `seconds`. Also exposes `cache_clear()`."""
+    def decorator(func):
+        cache = {}
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            hit = cache.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                return hit[1]
+            result = func(*args, **kwargs)
+            cache[key] = (time.monotonic() + seconds, result)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
 
 # === Account & Lookup Data (Read-Only) ===
+# Genders, currencies, countries and activity types never change during a run,
+# so they are fetched once per process. The rest expire after LOOKUP_TTL.
 
 def get_user() -> Dict[str, Any]:
     """GET /me - Fetches the authenticated user's details."""
     return call("me")
 
+@lru_cache(maxsize=1)
 def list_genders() -> List[Dict[str, Any]]:
     """GET /genders - Lists all available genders."""
     return call("genders")
 
+@lru_cache(maxsize=1)
 def list_currencies() -> List[Dict[str, Any]]:
     """GET /currencies - Lists all available currencies."""
     return call("currencies")
 
+@lru_cache(maxsize=1)
 def list_countries() -> List[Dict[str, Any]]:
     """GET /countries - Lists all available countries."""
     return call("countries")
 
+@lru_cache(maxsize=1)
 def list_activity_types() -> List[Dict[str, Any]]:
     """GET /activitytypes - Lists all available activity types."""
     return call("activitytypes")
 
+@_ttl_cache(LOOKUP_TTL)
 def list_contact_field_types() -> List[Dict[str, Any]]:
     """GET /contactfieldtypes - Lists all available contact field types."""
     return call("contactfieldtypes")
 
+@_ttl_cache(LOOKUP_TTL)
 def list_relationship_types() -> List[Dict[str, Any]]:
     """GET /relationshiptypes - Lists all available relationship types."""
     return call("relationshiptypes")
 
+def prefetch_lookups(max_workers: int = 4) -> Dict[str, Any]:
+    """Fetches the authenticated user and all read-only lookup lists concurrently over the pooled session.
+
+    Returns a dict keyed by 'user', 'genders', 'currencies', 'countries', 'activity_types',
+    'contact_field_types', 'relationship_types' and 'tags'. At most `max_workers`
+    requests are in flight at once, to stay clear of Monica's rate limit.
+    """
+    lookups = {
+        "user": get_user,
+        "genders": list_genders,
+        "currencies": list_currencies,
+        "countries": list_countries,
+        "activity_types": list_activity_types,
+        "contact_field_types": list_contact_field_types,
+        "relationship_types": list_relationship_types,
+        "tags": list_tags,
+    }
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {name: executor.submit(lookup) for name, lookup in lookups.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def invalidate_lookups():
+    """Drops every cached lookup list, so the next call refetches it."""
+    for lookup in (list_genders, list_currencies, list_countries, list_activity_types,
+                   list_contact_field_types, list_relationship_types, list_tags):
+        lookup.cache_clear()
+
 
 # === Contacts ===
 
+# Seconds a contact seen in a GET/POST/PUT response can stand in for the pre-read in update_contact().
+CONTACT_CACHE_TTL = 30
+# contact_id -> (time.monotonic() it was seen, contact)
+_contact_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+
+# Fields of the current contact that update_contact() carries over into the PUT, per Monica's schema.
+_CONTACT_PUT_FIELDS = frozenset([
+    'first_name', 'last_name', 'nickname', 'description', 'gender_id', 'is_partial',
+    'birthdate_day', 'birthdate_month', 'birthdate_year', 'birthdate_is_age_based', 'birthdate_age',
+    'deceased_date_add_reminder', 'deceased_date_day', 'deceased_date_month', 'deceased_date_year',
+    'deceased_date_is_age_based',
+])
+
+def _remember_contact(contact: Dict[str, Any]) -> Dict[str, Any]:
+    """Stores a contact from an API response in the short-lived cache, and returns it."""
+    if contact and "id" in contact:
+        _contact_cache[contact["id"]] = (time.monotonic(), contact)
+    return contact
+
+def _recent_contact(contact_id: int) -> Optional[Dict[str, Any]]:
+    """The cached contact if it was seen within CONTACT_CACHE_TTL seconds, otherwise None."""
+    seen_at, contact = _contact_cache.get(contact_id, (0.0, None))
+    if contact is not None and time.monotonic() - seen_at < CONTACT_CACHE_TTL:
+        return contact
+    return None
+
 def get_contact_by_name(name: str, exact_match: bool = True) -> Optional[Dict[str, Any]]:
     """Finds a single contact by their first or full name."""
     contacts = list_contacts(query=name)
@@ -126,9 +497,17 @@ def list_contacts(query: Optional[str] = None, page: int = 1, limit: int = 10) -
         params["query"] = query
     return call("contacts", params=params)
 
+def list_contacts_count(query: Optional[str] = None) -> int:
+    """Number of contacts (optionally matching `query`), read from meta.total."""
+    return count_items("contacts", query=query)
+
+def list_all_contacts(query: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yields every contact (optionally matching `query`), prefetching one page ahead."""
+    yield from iter_pages("contacts", query=query)
+
 def get_contact(contact_id: int) -> Dict[str, Any]:
     """GET /contacts/:id - Fetches a single contact by their ID."""
-    return call(f"contacts/{contact_id}")
+    return _remember_contact(call(f"contacts/{contact_id}"))
 
 def create_contact(first_name: str, **kwargs: Any) -> Dict[str, Any]:
     """POST /contacts - Creates a new contact. 'first_name' is required.
@@ -174,32 +553,33 @@ def create_contact(first_name: str, **kwargs: Any) -> Dict[str, Any]:
     """
     payload = {"first_name": first_name, "is_birthdate_known": False, "is_deceased": False, "is_deceased_date_known": False}
     payload.update(kwargs)
-    return call("contacts", "POST", payload)
+    return _remember_contact(call("contacts", "POST", payload))
 
 def update_contact(contact_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
-    """PUT /contacts/:id - Dynamically updates a contact's core fields."""
-    current_data = get_contact(contact_id)
-    payload = current_data.copy()
+    """PUT /contacts/:id - Dynamically updates a contact's core fields.
+
+    The current contact is taken from a response seen in the last CONTACT_CACHE_TTL
+    seconds when there is one, saving the GET that would otherwise precede the PUT.
+    """
+    current_data = _recent_contact(contact_id) or get_contact(contact_id)
+    payload = {key: current_data[key] for key in _CONTACT_PUT_FIELDS if key in current_data}
     payload['is_birthdate_known'] = current_data.get('birthdate', {}).get('is_known', False)
     payload['is_deceased'] = current_data.get('is_deceased', False)
     payload['is_deceased_date_known'] = current_data.get('deceased_date', {}).get('is_known', False)
     payload.update(updates)
-    if 'birthdate' in payload and payload.get('birthdate'):
-        payload['is_birthdate_known'] = payload['birthdate'].get('is_known', False)
-    if 'deceased_date' in payload and payload.get('deceased_date'):
-        payload['is_deceased_date_known'] = payload['deceased_date'].get('is_known', False)
-    fields_to_remove = [
-        'id', 'object', 'account', 'last_activity_date', 'created_at', 'updated_at', 'birthdate',
-        'deceased_date', 'information', 'contact_information', 'reminders', 'tasks',
-        'activities', 'relationships', 'gifts', 'pets', 'addresses', 'notes'
-    ]
-    for key in fields_to_remove:
-        payload.pop(key, None)
-    return call(f"contacts/{contact_id}", "PUT", payload)
+    # Nested date objects in `updates` only set the flags; the PUT takes the flat date fields.
+    birthdate = payload.pop('birthdate', None)
+    if birthdate:
+        payload['is_birthdate_known'] = birthdate.get('is_known', False)
+    deceased_date = payload.pop('deceased_date', None)
+    if deceased_date:
+        payload['is_deceased_date_known'] = deceased_date.get('is_known', False)
+    return _remember_contact(call(f"contacts/{contact_id}", "PUT", payload))
 
 def delete_contact(contact_id: int) -> Optional[Dict[str, Any]]:
     """DELETE /contacts/:id - Deletes a contact."""
     call(f"contacts/{contact_id}", "DELETE")
+    _contact_cache.pop(contact_id, None)
     return {"deleted": True, "id": contact_id}
 
 def set_contact_occupation(contact_id: int, job_title: str = "", company_name: str = "") -> Dict[str, Any]:
@@ -257,10 +637,7 @@ def update_address(address_id: int, contact_id: int, **kwargs: Any) -> Dict[str,
     payload.update(kwargs)
     return call(f"addresses/{address_id}", "PUT", payload=payload)
 
-def delete_address(address_id: int) -> Dict[str, Any]:
-    """DELETE /addresses/:id - Deletes an address."""
-    call(f"addresses/{address_id}", "DELETE")
-    return {"deleted": True, "id": address_id}
+delete_address = _make_deleter("delete_address", "addresses", "address_id", "DELETE /addresses/:id - Deletes an address.")
 
 
 # # === Contact Sub-Resources: Pets ===
@@ -314,10 +691,7 @@ def update_relationship(relationship_id: int, relationship_type_id: int) -> Dict
     """PUT /relationships/:id - Updates an existing relationship's type."""
     return call(f"relationships/{relationship_id}", "PUT", payload={"relationship_type_id": relationship_type_id})
 
-def delete_relationship(relationship_id: int) -> Optional[Dict[str, Any]]:
-    """DELETE /relationships/:id - Deletes a relationship."""
-    call(f"relationships/{relationship_id}", "DELETE")
-    return {"deleted": True, "id": relationship_id}
+delete_relationship = _make_deleter("delete_relationship", "relationships", "relationship_id", "DELETE /relationships/:id - Deletes a relationship.")
 
 
 # === Activities ===
@@ -416,10 +790,7 @@ def update_note(
 
     return call(f"notes/{note_id}", "PUT", payload)
 
-def delete_note(note_id: int) -> Dict[str, Any]:
-    """DELETE /notes/:id - Deletes a note."""
-    call(f"notes/{note_id}", "DELETE")
-    return {"deleted": True, "id": note_id}
+delete_note = _make_deleter("delete_note", "notes", "note_id", "DELETE /notes/:id - Deletes a note.")
 
 
 # === Reminders ===
@@ -469,10 +840,7 @@ def update_reminder(reminder_id: int, title: str = None, description: str = None
         
     return call(f"reminders/{reminder_id}", "PUT", payload)
 
-def delete_reminder(reminder_id: int) -> Optional[Dict[str, Any]]:
-    """DELETE /reminders/:id - Deletes a reminder."""
-    call(f"reminders/{reminder_id}", "DELETE")
-    return {"deleted": True, "id": reminder_id}
+delete_reminder = _make_deleter("delete_reminder", "reminders", "reminder_id", "DELETE /reminders/:id - Deletes a reminder.")
 
 
 # === Tasks ===
@@ -486,6 +854,10 @@ def list_tasks(contact_id: Optional[int] = None, page: int = 1, limit: int = 10)
     endpoint = f"contacts/{contact_id}/tasks" if contact_id else "tasks"
     return call(endpoint, params={"page": page, "limit": limit})
 
+def list_tasks_count(contact_id: Optional[int] = None) -> int:
+    """Number of tasks, or of a specific contact's tasks, read from meta.total."""
+    return count_items(f"contacts/{contact_id}/tasks" if contact_id else "tasks")
+
 
 def create_task(
     title: str,
@@ -555,6 +927,10 @@ def list_debts(
     endpoint = f"contacts/{contact_id}/debts" if contact_id else "debts"
     return call(endpoint, params={"page": page, "limit": limit})
 
+def list_debts_count(contact_id: Optional[int] = None) -> int:
+    """Number of debts, or of a specific contact's debts, read from meta.total."""
+    return count_items(f"contacts/{contact_id}/debts" if contact_id else "debts")
+
 
 def get_debt(debt_id: int) -> Dict[str, Any]:
     """GET /debts/:id - Gets a specific debt."""
@@ -610,6 +986,7 @@ def delete_debt(debt_id: int) -> Dict[str, Any]:
 # === Tags ===
 
 
+@_ttl_cache(LOOKUP_TTL)
 def list_tags(page: int = 1, limit: int = 10) -> List[Dict[str, Any]]:
     """GET /tags - Lists all available tags in the account."""
     return call("tags", params={"page": page, "limit": limit})
@@ -620,26 +997,47 @@ def get_tag(tag_id: int) -> Dict[str, Any]:
 
 def create_tag(name: str) -> Dict[str, Any]:
     """POST /tags - Creates a new tag."""
-    return call("tags", "POST", {"name": name})
+    result = call("tags", "POST", {"name": name})
+    list_tags.cache_clear()
+    return result
 
 def update_tag(tag_id: int, name: str) -> Dict[str, Any]:
     """PUT /tags/:id - Updates a tag's name."""
-    return call(f"tags/{tag_id}", "PUT", {"name": name})
+    result = call(f"tags/{tag_id}", "PUT", {"name": name})
+    list_tags.cache_clear()
+    return result
 
 def delete_tag(tag_id: int) -> Dict[str, Any]:
     """DELETE /tags/:id - Deletes a tag from the account."""
-    return call(f"tags/{tag_id}", "DELETE")
+    result = call(f"tags/{tag_id}", "DELETE")
+    list_tags.cache_clear()
+    return result
 
 def set_tags_for_contact(contact_id: int, tag_names: List[str]) -> Dict[str, Any]:
     """POST /contacts/:id/setTags - Associates a list of tags with a contact, creating them if necessary."""
     payload = {"tags": tag_names}
-    return call(f"contacts/{contact_id}/setTags", "POST", payload)
+    result = call(f"contacts/{contact_id}/setTags", "POST", payload)
+    list_tags.cache_clear()
+    return result
 
 def unset_tags_for_contact(contact_id: int, tag_ids: List[int]) -> Dict[str, Any]:
     """POST /contacts/:id/unsetTag - Removes one or more specific tags from a contact by their IDs."""
     payload = {"tags": tag_ids}
     return call(f"contacts/{contact_id}/unsetTag", "POST", payload)
 
+def batch_tag_ops(contact_id: int, set_names: List[str], unset_ids: List[int]) -> Dict[str, Any]:
+    """Sets the named tags on a contact, then removes the given tag IDs, in one setTags and one unsetTag call.
+
+    Either list may be empty, in which case its call is skipped. Returns the contact
+    as returned by the last call made.
+    """
+    result = None
+    if set_names:
+        result = set_tags_for_contact(contact_id, set_names)
+    if unset_ids:
+        result = unset_tags_for_contact(contact_id, unset_ids)
+    return result
+
 def unset_all_tags_for_contact(contact_id: int) -> Dict[str, Any]:
     """POST /contacts/:id/unsetTags - Removes all tags from a contact."""
     return call(f"contacts/{contact_id}/unsetTags", "POST")
@@ -650,6 +1048,10 @@ def list_journal_entries(page: int = 1, limit: int = 10) -> List[Dict[str, Any]]
     """GET /journal - Lists all entries in your journal."""
     return call("journal", params={"page": page, "limit": limit})
 
+def list_journal_entries_count() -> int:
+    """Number of journal entries, read from meta.total."""
+    return count_items("journal")
+
 def get_journal_entry(journal_id: int) -> Dict[str, Any]:
     """GET /journal/:id - Gets a specific journal entry."""
     return call(f"journal/{journal_id}")
@@ -687,6 +1089,10 @@ def list_gifts(
     endpoint = f"contacts/{contact_id}/gifts" if contact_id else "gifts"
     return call(endpoint, params={"page": page, "limit": limit})
 
+def list_gifts_count(contact_id: Optional[int] = None) -> int:
+    """Number of gifts, or of a specific contact's gifts, read from meta.total."""
+    return count_items(f"contacts/{contact_id}/gifts" if contact_id else "gifts")
+
 
 def get_gift(gift_id: int) -> Dict[str, Any]:
     """GET /gifts/:id - Gets a specific gift."""
@@ -769,6 +1175,10 @@ def list_calls(
     endpoint = f"contacts/{contact_id}/calls" if contact_id else "calls"
     return call(endpoint, params={"page": page, "limit": limit})
 
+def list_calls_count(contact_id: Optional[int] = None) -> int:
+    """Number of calls, or of a specific contact's calls, read from meta.total."""
+    return count_items(f"contacts/{contact_id}/calls" if contact_id else "calls")
+
 
 def get_call(call_id: int) -> Dict[str, Any]:
     """GET /calls/:id - Gets a specific call."""
@@ -810,6 +1220,10 @@ def list_conversations(
     endpoint = f"contacts/{contact_id}/conversations" if contact_id else "conversations"
     return call(endpoint, params={"page": page, "limit": limit})
 
+def list_conversations_count(contact_id: Optional[int] = None) -> int:
+    """Number of conversations, or of a specific contact's conversations, read from meta.total."""
+    return count_items(f"contacts/{contact_id}/conversations" if contact_id else "conversations")
+
 
 def get_conversation(conversation_id: int) -> Dict[str, Any]:
     """GET /conversations/:id - Gets a specific conversation, including its messages."""
@@ -893,6 +1307,10 @@ def list_companies() -> List[Dict[str, Any]]:
     """GET /companies - Lists all companies."""
     return call("companies")
 
+def list_companies_count() -> int:
+    """Number of companies, read from meta.total."""
+    return count_items("companies")
+
 def get_company(company_id: int) -> Dict[str, Any]:
     """GET /companies/:id - Gets a specific company."""
     return call(f"companies/{company_id}")
@@ -934,10 +1352,7 @@ def create_company(name: str, **kwargs: Any) -> Dict[str, Any]:
     payload.update(kwargs)
     return call("companies", "POST", payload)
 
-def delete_company(company_id: int) -> Dict[str, Any]:
-    """DELETE /companies/:id - Deletes a company."""
-    call(f"companies/{company_id}", "DELETE")
-    return {"deleted": True, "id": company_id}
+delete_company = _make_deleter("delete_company", "companies", "company_id", "DELETE /companies/:id - Deletes a company.")
 
 
 # === Example Usage ===
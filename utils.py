@@ -1,30 +1,108 @@
-import json
+import atexit
 import os
+import queue
+import threading
+import time
+from collections import Counter
+
+import orjson
+
+DATA_FILE = 'api_calls_count.json'
+
+# Calls counted since the last flush. They are merged into DATA_FILE at most once per
+# DRAIN_INTERVAL, and once more at exit, instead of re-reading and rewriting the file on every call.
+_pending_total = 0
+_pending_files = Counter()
+_lock = threading.Lock()
+# Serializes flushes, so the drain thread and the exit flush never merge into DATA_FILE at once.
+_flush_lock = threading.Lock()
+
+# count_api_call only enqueues the caller's filename; a daemon thread tallies the queue
+# and flushes it to DATA_FILE every DRAIN_INTERVAL seconds, off the request path.
+DRAIN_INTERVAL = 1.0
+_queue = queue.SimpleQueue()
+# Full __file__ path -> basename, since the same few source files make every call.
+_basenames = {}
 
 def count_api_call(filename: str):
-    data_file = 'api_calls_count.json'
+    _queue.put_nowait(filename)
+
+def _drain():
+    """Tallies every queued call into the pending counters."""
+    global _pending_total
+    with _lock:
+        while True:
+            try:
+                filename = _queue.get_nowait()
+            except queue.Empty:
+                return
+            file_basename = _basenames.get(filename)
+            if file_basename is None:
+                file_basename = _basenames[filename] = os.path.basename(filename)
+            _pending_total += 1
+            _pending_files[file_basename] += 1
+
+def _drain_forever():
+    while True:
+        time.sleep(DRAIN_INTERVAL)
+        try:
+            flush_api_call_counts()
+        except Exception:
+            # The counts were put back; the next interval or the exit flush retries them.
+            pass
+
+threading.Thread(target=_drain_forever, name="api-call-counter", daemon=True).start()
+
+def _read_counts() -> dict:
     data = {
         "total_calls": 0,
         "files": {}
     }
 
-    if os.path.exists(data_file):
+    if os.path.exists(DATA_FILE):
         try:
-            with open(data_file, 'r') as f:
+            with open(DATA_FILE, 'rb') as f:
                 content = f.read()
                 if content:
-                    data = json.loads(content)
+                    data = orjson.loads(content)
                 if "total_calls" not in data:
                     data["total_calls"] = 0
                 if "files" not in data:
                     data["files"] = {}
-        except (json.JSONDecodeError, FileNotFoundError):
+        except (orjson.JSONDecodeError, FileNotFoundError):
             pass
+    return data
 
-    data["total_calls"] = data.get("total_calls", 0) + 1
+def flush_api_call_counts():
+    """Adds the pending counts to DATA_FILE in a single atomic write.
+
+    Called every DRAIN_INTERVAL by the counter thread when there are new calls, and at exit.
+    """
+    global _pending_total
+    with _flush_lock:
+        _drain()
+        with _lock:
+            total, files = _pending_total, dict(_pending_files)
+            _pending_total = 0
+            _pending_files.clear()
+        if not total:
+            return
+
+        try:
+            # Merged into what is on disk now, so counts written by other processes are kept.
+            data = _read_counts()
+            data["total_calls"] = data.get("total_calls", 0) + total
+            for file_basename, count in files.items():
+                data["files"][file_basename] = data["files"].get(file_basename, 0) + count
 
-    file_basename = os.path.basename(filename)
-    data["files"][file_basename] = data["files"].get(file_basename, 0) + 1
+            tmp_file = f"{DATA_FILE}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, DATA_FILE)
+        except Exception:
+            with _lock:
+                _pending_total += total
+                _pending_files.update(files)
+            raise
 
-    with open(data_file, 'w') as f:
-        json.dump(data, f, indent=4)
\ No newline at end of file
+atexit.register(flush_api_call_counts)